@@ -0,0 +1,339 @@
+"""Benchmarks for the Log File Processor"""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import calendar
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+
+from log_processor import ErrorColumnReader, process_log_file
+
+try:
+    import resource  # Unix only; peak RSS is reported as None elsewhere
+except ImportError:
+    resource = None
+
+# Messages used to build the synthetic log. "{id}" is filled with a random
+# number so there are many distinct messages, like a real server
+MESSAGES = {
+    "INFO": [
+        "Server started successfully",
+        "User login successful: user_id={id}",
+        "File uploaded successfully",
+        "Health check passed",
+    ],
+    "WARNING": ["High memory usage detected", "Slow response from cache: {id}ms"],
+    "ERROR": [
+        "Database connection failed",
+        "Invalid API key provided",
+        "Payment declined: order_id={id}",
+    ],
+}
+DEFAULT_MIX = {"INFO": 90, "WARNING": 7, "ERROR": 3}
+
+# Processing modes: keyword arguments for process_log_file
+MODES = {
+    "text": {},
+    "mmap": {"backend": "mmap"},
+    "parallel": {"workers": os.cpu_count() or 1},
+    "templates": {"templates": True},
+    "top_k": {"top_k": 100},
+    "bucket": {"bucket": "hour"},
+    "columns": {"columns_path": "errors.bin"},
+}
+
+# Lines processed under tracemalloc for the allocation figures (it's slow)
+ALLOCATION_SAMPLE_LINES = 50_000
+
+
+def parse_mix(text):
+    """Turn "INFO=90,WARNING=7,ERROR=3" into {"INFO": 90.0, "WARNING": 7.0, ...}."""
+    mix = {}
+    for part in text.split(","):
+        level, _, weight = part.partition("=")
+        level = level.strip().upper()
+        if level not in MESSAGES:
+            raise argparse.ArgumentTypeError(f"unknown level: {level}")
+        try:
+            mix[level] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"bad weight for {level}: {weight!r}")
+    return mix
+
+
+def generate_log(file_path, size_mb, seed=42, mix=None):
+    """
+    Write a synthetic server log of roughly the requested size.
+    The same size, seed and mix always produce the same file.
+    Args:
+        file_path (Path): Path to the log file to create.
+        size_mb (float): Target size of the file in megabytes.
+        seed (int): Seed for the random generator so runs are repeatable.
+        mix (dict): Relative weight of each level, e.g. {"INFO": 90, "ERROR": 10}.
+    Returns:
+        int: The number of lines written.
+    """
+    rng = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    levels = list(mix)
+    weights = [mix[level] for level in levels]
+    target_bytes = int(size_mb * 1024 * 1024)
+    written = 0
+    lines = 0
+    epoch = calendar.timegm((2026, 3, 2, 0, 0, 0))
+    stamp_epoch = None
+
+    with open(file_path, "w", encoding="utf-8") as f:
+        while written < target_bytes:
+            # Build lines in batches so the generator isn't slower than the processor
+            batch = []
+            for level in rng.choices(levels, weights, k=10_000):
+                message = rng.choice(MESSAGES[level])
+                if "{id}" in message:
+                    message = message.replace("{id}", str(rng.randrange(1_000_000)))
+                # Time only moves forward, like a real log; the formatted
+                # timestamp is reused until the second changes
+                epoch += rng.random() < 0.5
+                if epoch != stamp_epoch:
+                    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(epoch))
+                    stamp_epoch = epoch
+                batch.append(f"{stamp} {level} {message}\n")
+            chunk = "".join(batch)
+            f.write(chunk)
+            written += len(chunk)
+            lines += len(batch)
+
+    return lines
+
+
+def count_lines(file_path):
+    """Count the lines in a file without decoding it."""
+    with open(file_path, "rb") as f:
+        return sum(block.count(b"\n") for block in iter(lambda: f.read(1 << 20), b""))
+
+
+def peak_rss_kb():
+    """Peak resident memory of this process and its children, in KB (Linux units)."""
+    if resource is None:
+        return None
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children)
+
+
+def mode_kwargs(mode, out_dir):
+    """Return process_log_file keyword arguments for a mode, with paths resolved."""
+    kwargs = dict(MODES[mode])
+    if "columns_path" in kwargs:
+        kwargs["columns_path"] = out_dir / kwargs["columns_path"]
+    return kwargs
+
+
+def run_mode(mode, server_log, out_dir):
+    """
+    Time one processing mode (runs in a fresh process so peak RSS is its own).
+    Returns:
+        dict: seconds and peak_rss_kb for the run.
+    """
+    start = time.perf_counter()
+    process_log_file(server_log, out_dir / f"errors_{mode}.log",
+                     out_dir / f"summary_{mode}.json", **mode_kwargs(mode, out_dir))
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "peak_rss_kb": peak_rss_kb()}
+
+
+def measure_allocations(mode, sample_log, sample_lines, out_dir):
+    """
+    Process a small sample under tracemalloc (runs in a fresh process).
+    CPython keeps no running count of allocations, so this reports the bytes
+    allocated per line at the peak and the memory blocks still held afterwards.
+    """
+    kwargs = mode_kwargs(mode, out_dir)
+    kwargs.pop("workers", None)  # tracemalloc can't see into worker processes
+
+    tracemalloc.start()
+    process_log_file(sample_log, out_dir / f"errors_{mode}_sample.log",
+                     out_dir / f"summary_{mode}_sample.json", **kwargs)
+    current, peak = tracemalloc.get_traced_memory()
+    blocks = len(tracemalloc.take_snapshot().traces)
+    tracemalloc.stop()
+
+    return {
+        "traced_peak_bytes_per_line": round(peak / sample_lines, 2),
+        "traced_retained_bytes": current,
+        "traced_retained_blocks": blocks,
+    }
+
+
+def benchmark_modes(server_log, out_dir, modes):
+    """
+    Run each processing mode over the log and collect its figures.
+    Args:
+        server_log (Path): The log to process.
+        out_dir (Path): Folder for the outputs of each run.
+        modes (list): Names from MODES to run.
+    Returns:
+        list: One result dictionary per mode.
+    """
+    size = os.path.getsize(server_log)
+    lines = count_lines(server_log)
+
+    # A copy of the start of the log for the (much slower) tracemalloc runs
+    sample_log = out_dir / "sample.log"
+    with open(server_log, "rb") as src, open(sample_log, "wb") as dst:
+        for _, line in zip(range(ALLOCATION_SAMPLE_LINES), src):
+            dst.write(line)
+    sample_lines = count_lines(sample_log) or 1
+
+    results = []
+    for mode in modes:
+        # A new single-worker pool per run, so one mode's memory can't leak
+        # into the next one's peak RSS
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            timing = pool.submit(run_mode, mode, server_log, out_dir).result()
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            allocations = pool.submit(measure_allocations, mode, sample_log,
+                                      sample_lines, out_dir).result()
+
+        seconds = timing["seconds"]
+        result = {
+            "mode": mode,
+            "options": {key: str(value) for key, value in MODES[mode].items()},
+            "seconds": round(seconds, 3),
+            "lines_per_s": round(lines / seconds),
+            "mb_per_s": round(size / 1024 / 1024 / seconds, 2),
+            "peak_rss_kb": timing["peak_rss_kb"],
+            **allocations,
+        }
+        results.append(result)
+        print(f"{mode:<10} {result['lines_per_s']:>11,} lines/s "
+              f"{result['mb_per_s']:>7.2f} MB/s  "
+              f"peak RSS {result['peak_rss_kb']} KB  "
+              f"{result['traced_peak_bytes_per_line']} B/line")
+
+    return results
+
+
+def grep_errors_between(errors_log_path, start_stamp, end_stamp):
+    """Time-range query the text way: read errors.log and compare each timestamp."""
+    matches = []
+    with open(errors_log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            # "YYYY-MM-DD HH:MM:SS" sorts as text, so no date parsing is needed
+            if start_stamp <= line[:19] < end_stamp:
+                matches.append(line.rstrip("\n").split(" ", 3)[3])
+    return matches
+
+
+def benchmark_columns(server_log, out_dir):
+    """Compare a one-hour time-range query on errors.bin against scanning errors.log."""
+    errors_log = out_dir / "errors.log"
+    columns = out_dir / "errors.bin"
+    process_log_file(server_log, errors_log, out_dir / "summary.json",
+                     columns_path=columns)
+
+    with ErrorColumnReader(columns) as reader:
+        # Query the hour in the middle of the log
+        middle = reader.epochs[reader.count // 2] if reader.count else 0
+        start_epoch = middle - middle % 3600
+        end_epoch = start_epoch + 3600
+
+        start = time.perf_counter()
+        column_matches = [message for _, message
+                          in reader.between(start_epoch, end_epoch)]
+        column_time = time.perf_counter() - start
+
+    start_stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(start_epoch))
+    end_stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(end_epoch))
+    start = time.perf_counter()
+    text_matches = grep_errors_between(errors_log, start_stamp, end_stamp)
+    text_time = time.perf_counter() - start
+
+    print(f"Query {start_stamp} to {end_stamp}: {len(column_matches)} errors")
+    print(f"errors.log scan: {text_time * 1000:.2f}ms")
+    print(f"errors.bin query: {column_time * 1000:.2f}ms "
+          f"({text_time / column_time:.0f}x faster)")
+    print(f"Results match: {column_matches == text_matches}")
+
+
+def main():
+    """Generate (or reuse) a synthetic log and run the benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmark the log processor.")
+    parser.add_argument("--size-mb", type=float, default=1024,
+                        help="size of the synthetic log in MB (default: 1024)")
+    parser.add_argument("--seed", type=int, default=42,
+                        help="random seed for the generator (default: 42)")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="level weights, e.g. INFO=90,WARNING=7,ERROR=3")
+    parser.add_argument("--log", type=Path,
+                        help="keep the generated log here, or reuse it if it exists")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES),
+                        help="processing modes to run (default: all)")
+    parser.add_argument("--output", type=Path,
+                        default=Path("log_benchmark_results.json"),
+                        help="where to save the results JSON")
+    parser.add_argument("--columns", action="store_true",
+                        help="benchmark time-range queries on errors.bin vs errors.log")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        server_log = args.log or out_dir / "server.log"
+
+        if args.log is not None and args.log.exists():
+            print(f"Reusing {server_log}")
+        else:
+            print(f"Generating {args.size_mb:g} MB synthetic log...")
+            generate_log(server_log, args.size_mb, args.seed, args.mix)
+
+        if args.columns:
+            benchmark_columns(server_log, out_dir)
+            return
+
+        results = benchmark_modes(server_log, out_dir, args.modes)
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "log": {
+            "path": str(args.log) if args.log else None,
+            "size_mb": args.size_mb,
+            "seed": args.seed,
+            "mix": args.mix,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4)
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ? Example output (50 MB log, 1 CPU):
+# Generating 50 MB synthetic log...
+# text         1,148,412 lines/s   58.77 MB/s  peak RSS 16816 KB  2.08 B/line
+# mmap         6,600,215 lines/s  337.74 MB/s  peak RSS 68348 KB  2.08 B/line
+# parallel     1,246,171 lines/s   63.77 MB/s  peak RSS 17012 KB  2.08 B/line
+# templates    1,056,109 lines/s   54.04 MB/s  peak RSS 18552 KB  3.33 B/line
+# top_k        1,086,565 lines/s   55.60 MB/s  peak RSS 17024 KB  1.34 B/line
+# bucket         361,665 lines/s   18.51 MB/s  peak RSS 48040 KB  34.03 B/line
+# columns      1,153,121 lines/s   59.01 MB/s  peak RSS 18044 KB  4.22 B/line
+# Results saved to log_benchmark_results.json
+
+# ? Example output with --columns (50 MB log, INFO=50,ERROR=50):
+# Generating 50 MB synthetic log...
+# Query 2026-03-04 20:00:00 to 2026-03-04 21:00:00: 3514 errors
+# errors.log scan: 129.26ms
+# errors.bin query: 1.10ms (118x faster)
+# Results match: True
@@ -1,9 +1,812 @@
 """Assignment: Log File Processor"""
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+import argparse
+import bz2
+import calendar
+import ctypes
+import ctypes.util
+import glob
+import gzip
+import heapq
 import json
+import lzma
+import mmap
+import os
+import re
+import select
+import shutil
+import struct
+import sys
+import tempfile
+import time
 
+# inotify event flags (from <sys/inotify.h>) used by follow mode
+IN_MODIFY = 0x00000002
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len (name follows)
+FOLLOW_CHUNK_SIZE = 1024 * 1024  # Bytes read at a time in follow mode
 
-def process_log_file(server_log_path, errors_log_path, summary_json_path):
+
+# Time bucket sizes for the error histogram: how many characters of
+# "DATE TIME" to keep, the format used to check them, and what to append
+BUCKET_FORMATS = {
+    "minute": (16, "%Y-%m-%d %H:%M", ""),  # 2026-03-02 10:17
+    "hour": (13, "%Y-%m-%d %H", ":00"),  # 2026-03-02 10:00
+    "day": (10, "%Y-%m-%d", ""),  # 2026-03-02
+}
+
+
+@lru_cache(maxsize=65536)
+def bucket_label(stamp_prefix, bucket):
+    """
+    Turn the start of a log timestamp into the label of its time bucket.
+    Logs repeat the same minute/hour/day on thousands of lines, so the result is
+    cached and datetime.strptime only runs once per distinct bucket.
+    Args:
+        stamp_prefix (str): "DATE TIME" cut down to the bucket size.
+        bucket (str): "minute", "hour" or "day".
+    Returns:
+        str: The bucket label, or None if the timestamp is not valid.
+    """
+    _, fmt, suffix = BUCKET_FORMATS[bucket]
+    try:
+        datetime.strptime(stamp_prefix, fmt)
+    except ValueError:
+        return None
+    return stamp_prefix + suffix
+
+
+# Variable parts of a message and the placeholder that replaces each one.
+# Compiled once into a single pattern; earlier entries win where they overlap
+TEMPLATE_TOKENS = [
+    ("UUID", r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-"
+             r"[0-9a-fA-F]{12}\b"),
+    ("IP", r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"),
+    ("HEX", r"\b0x[0-9a-fA-F]+\b|\b(?=[0-9a-fA-F]*\d)[0-9a-fA-F]{8,}\b"),
+    ("NUM", r"\b\d+(?:\.\d+)?"),  # Also matches units, e.g. 3.5s -> <NUM>s
+]
+TEMPLATE_PATTERN = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in TEMPLATE_TOKENS))
+
+
+@lru_cache(maxsize=65536)
+def message_template(message):
+    """
+    Replace the variable parts of a message with placeholders.
+    e.g. "User login successful: user_id=1" -> "User login successful: user_id=<NUM>"
+    Results are cached, so a message seen before costs a single dict lookup; the
+    cache size is fixed so messages full of unique IDs can't fill up memory.
+    """
+    return TEMPLATE_PATTERN.sub(lambda match: f"<{match.lastgroup}>", message)
+
+
+@lru_cache(maxsize=4096)
+def day_start_epoch(date):
+    """Return the epoch seconds at midnight (UTC) of a YYYY-MM-DD date, or None."""
+    try:
+        return calendar.timegm(datetime.strptime(date, "%Y-%m-%d").timetuple())
+    except ValueError:
+        return None
+
+
+def timestamp_to_epoch(date, time_str):
+    """
+    Convert the DATE and TIME fields of a log line to epoch seconds.
+    The date is parsed once per day (cached) and the time is read by slicing, so
+    this stays cheap when called for every ERROR line. Timestamps are taken as UTC.
+    Returns:
+        int: Epoch seconds, or None if the timestamp is not valid.
+    """
+    day = day_start_epoch(date)
+    if day is None or len(time_str) < 8:
+        return None
+    try:
+        hours = int(time_str[0:2])
+        minutes = int(time_str[3:5])
+        seconds = int(time_str[6:8])
+    except ValueError:
+        return None
+    if hours > 23 or minutes > 59 or seconds > 59:
+        return None
+    return day + hours * 3600 + minutes * 60 + seconds
+
+
+# Columnar error file: header, then one int64 epoch per record, then one uint32
+# message id per record, then the string table (uint32 length + UTF-8 bytes each)
+COLUMNS_MAGIC = b"ERRC"
+COLUMNS_VERSION = 1
+COLUMNS_HEADER = struct.Struct("<4sHHQQ")  # magic, version, flags, records, strings
+COLUMNS_SORTED = 0x1  # Epochs are in ascending order, so ranges can use bisect
+COLUMNS_BIG_ENDIAN = 0x2  # Arrays were written on a big-endian machine
+
+
+class ErrorColumns:
+    """
+    ERROR records collected as columns: an epoch-seconds array, a message id
+    array, and a string table that stores each distinct message once.
+    """
+
+    def __init__(self):
+        self.epochs = array("q")
+        self.message_ids = array("I")
+        self.messages = []  # The string table, indexed by message id
+        self._ids = {}  # message -> id, so each message is only stored once
+
+    def intern(self, message):
+        """Return the id of a message, adding it to the string table if it is new."""
+        message_id = self._ids.get(message)
+        if message_id is None:
+            message_id = len(self.messages)
+            self._ids[message] = message_id
+            self.messages.append(message)
+        return message_id
+
+    def add(self, date, time_str, message):
+        """Add one ERROR record; records with an invalid timestamp are skipped."""
+        epoch = timestamp_to_epoch(date, time_str)
+        if epoch is not None:
+            self.epochs.append(epoch)
+            self.message_ids.append(self.intern(message))
+
+    def extend(self, other):
+        """Append another collection's records (e.g. from a later chunk)."""
+        # Message ids differ between collections, so map them into this table
+        id_map = [self.intern(message) for message in other.messages]
+        self.epochs.extend(other.epochs)
+        self.message_ids.extend(id_map[message_id] for message_id in other.message_ids)
+
+    def write(self, columns_path):
+        """Write the records to a binary file that ErrorColumnReader can map."""
+        flags = 0
+        if all(a <= b for a, b in zip(self.epochs, self.epochs[1:])):
+            flags |= COLUMNS_SORTED
+        if sys.byteorder == "big":
+            flags |= COLUMNS_BIG_ENDIAN
+
+        with open(columns_path, "wb") as out:
+            out.write(COLUMNS_HEADER.pack(COLUMNS_MAGIC, COLUMNS_VERSION, flags,
+                                          len(self.epochs), len(self.messages)))
+            self.epochs.tofile(out)
+            self.message_ids.tofile(out)
+            for message in self.messages:
+                encoded = message.encode("utf-8")
+                out.write(struct.pack("<I", len(encoded)))
+                out.write(encoded)
+
+
+class ErrorColumnReader:
+    """
+    Read a columnar error file written by ErrorColumns.write().
+    The epoch and message id columns are memory-mapped, not loaded, so opening a
+    large file is instant and a time-range query only touches the records it needs.
+
+    Usage:
+        with ErrorColumnReader("errors.bin") as reader:
+            for epoch, message in reader.between(start, end):
+                ...
+    """
+
+    def __init__(self, columns_path):
+        self._file = open(columns_path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{columns_path} is empty, not a columnar error file")
+        if len(self._map) < COLUMNS_HEADER.size:
+            self.close()
+            raise ValueError(f"{columns_path} is too short to be a columnar error file")
+
+        header = COLUMNS_HEADER.unpack_from(self._map)
+        magic, version, flags, count, string_count = header
+        if magic != COLUMNS_MAGIC or version != COLUMNS_VERSION:
+            self.close()
+            raise ValueError(f"{columns_path} is not a columnar error file (v1)")
+        if bool(flags & COLUMNS_BIG_ENDIAN) != (sys.byteorder == "big"):
+            self.close()
+            raise ValueError(f"{columns_path} was written with a different byte order")
+
+        self.count = count
+        self.is_sorted = bool(flags & COLUMNS_SORTED)
+
+        # Views straight onto the mapped file: no copying, no parsing
+        view = memoryview(self._map)
+        epochs_start = COLUMNS_HEADER.size
+        ids_start = epochs_start + 8 * count
+        strings_start = ids_start + 4 * count
+        if strings_start > len(self._map):
+            view.release()
+            self.close()
+            raise ValueError(f"{columns_path} is cut short: it should hold {count} records")
+        self.epochs = view[epochs_start:ids_start].cast("q")
+        self.message_ids = view[ids_start:strings_start].cast("I")
+        view.release()
+
+        # The string table is small (one entry per distinct message), so load it
+        self.messages = []
+        offset = strings_start
+        try:
+            for _ in range(string_count):
+                (length,) = struct.unpack_from("<I", self._map, offset)
+                offset += 4
+                if offset + length > len(self._map):
+                    raise ValueError("string runs past the end of the file")
+                self.messages.append(self._map[offset:offset + length].decode("utf-8"))
+                offset += length
+        except (struct.error, ValueError) as e:  # Includes UnicodeDecodeError
+            self.close()
+            raise ValueError(f"{columns_path} has a damaged string table ({e})") from e
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release the memory views and close the mapped file."""
+        for name in ("epochs", "message_ids"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+        self._file.close()
+
+    def index_range(self, start_epoch, end_epoch):
+        """
+        Return the record indexes with start_epoch <= epoch < end_epoch.
+        Uses binary search when the epochs are sorted, otherwise a full scan.
+        """
+        if self.is_sorted:
+            first = bisect_left(self.epochs, start_epoch)
+            last = bisect_right(self.epochs, end_epoch - 1)
+            return range(first, last)
+        return [i for i, epoch in enumerate(self.epochs)
+                if start_epoch <= epoch < end_epoch]
+
+    def between(self, start_epoch, end_epoch):
+        """Yield (epoch, message) for every record in [start_epoch, end_epoch)."""
+        for i in self.index_range(start_epoch, end_epoch):
+            yield self.epochs[i], self.messages[self.message_ids[i]]
+
+
+class LogSummary:
+    """
+    Running totals collected while scanning a server log.
+    error_counts maps each ERROR message to its count. When a bucket size is given,
+    histogram also maps bucket label -> level -> message -> count for every line.
+    When top_k is given, only the top_k most frequent messages are tracked using
+    the Space-Saving algorithm, so memory stays fixed however many distinct
+    messages the log has; error_bounds then holds how much each count may be
+    over-estimated by. When templates is True, messages are counted by their
+    template (see message_template) instead of their exact text. When columns is
+    True, every ERROR record is also kept in an ErrorColumns collection.
+    """
+
+    def __init__(self, bucket=None, top_k=None, templates=False, columns=False):
+        if bucket is not None and bucket not in BUCKET_FORMATS:
+            raise ValueError(f"bucket must be one of {list(BUCKET_FORMATS)}")
+        if top_k is not None and top_k < 1:
+            raise ValueError("top_k must be at least 1")
+        if top_k is not None and bucket is not None:
+            # The histogram keeps every message, which would undo the memory limit
+            raise ValueError("top_k cannot be combined with time buckets")
+        self.bucket = bucket
+        self.top_k = top_k
+        self.templates = templates
+        self.error_counts = {}
+        self.histogram = {} if bucket is not None else None
+        self.error_bounds = {} if top_k is not None else None
+        self.total_errors = 0
+        self.file_stats = None  # Per-file throughput when several files are read
+        self.columns = ErrorColumns() if columns else None
+        self._heap = []  # (count, message) pairs; counts may be stale (too low)
+
+    @property
+    def settings(self):
+        """The options this summary was created with."""
+        return {
+            "bucket": self.bucket,
+            "top_k": self.top_k,
+            "templates": self.templates,
+            "columns": self.columns is not None,
+        }
+
+    def add(self, line):
+        """
+        Count one stripped log line.
+        Returns:
+            bool: True if the line is an ERROR record and should go to errors.log.
+        """
+        # Format: DATE TIME LEVEL MESSAGE
+        # Split into 4 parts: date, time, level, and message
+        parts = line.split(" ", 3)
+        if len(parts) < 4:  # If the line doesn't have enough parts, skip it
+            return False
+
+        date, time_str, level, message = parts
+        raw_message = message
+        # Only template messages that will be counted: ERROR lines, plus every line
+        # when there is a histogram. Templating INFO lines too would waste regex
+        # work and push the ERROR templates out of the message_template cache.
+        if self.templates and (level == "ERROR" or self.histogram is not None):
+            message = message_template(message)
+
+        if self.histogram is not None:
+            length = BUCKET_FORMATS[self.bucket][0]
+            label = bucket_label(f"{date} {time_str}"[:length], self.bucket)
+            if label is not None:
+                levels = self.histogram.setdefault(label, {})
+                messages = levels.setdefault(level, {})
+                messages[message] = messages.get(message, 0) + 1
+
+        if level != "ERROR":
+            return False
+
+        if self.columns is not None:
+            # The columnar output keeps the exact message, like errors.log
+            self.columns.add(date, time_str, raw_message)
+
+        # Count the message only
+        self.total_errors += 1
+        if self.top_k is None:
+            self.error_counts[message] = self.error_counts.get(message, 0) + 1
+        else:
+            self._add_top_k(message, 1)
+        return True
+
+    def _pop_min(self):
+        """Remove and return the (count, message) pair with the smallest count."""
+        while True:
+            count, message = heapq.heappop(self._heap)
+            current = self.error_counts[message]
+            if current == count:
+                return count, message
+            # The entry is out of date; put it back with its real count
+            heapq.heappush(self._heap, (current, message))
+
+    def _add_top_k(self, message, count, error=0):
+        """Space-Saving update: count a message, evicting the smallest if full."""
+        if message in self.error_counts:
+            self.error_counts[message] += count
+            self.error_bounds[message] += error
+            return
+
+        if len(self.error_counts) < self.top_k:
+            self.error_counts[message] = count
+            self.error_bounds[message] = error
+            heapq.heappush(self._heap, (count, message))
+            return
+
+        # Full: the new message takes over the smallest counter, and that old
+        # count becomes the most this message's count can be over by
+        min_count, evicted = self._pop_min()
+        del self.error_counts[evicted]
+        del self.error_bounds[evicted]
+        self.error_counts[message] = min_count + count
+        self.error_bounds[message] = min_count + error
+        heapq.heappush(self._heap, (min_count + count, message))
+
+    def _rebuild_heap(self):
+        """Recreate the min-heap from error_counts (e.g. after loading)."""
+        self._heap = [(count, message) for message, count in self.error_counts.items()]
+        heapq.heapify(self._heap)
+
+    def merge(self, other):
+        """Add another summary's totals to this one (e.g. from a later chunk)."""
+        self.total_errors += other.total_errors
+        if self.columns is not None and other.columns is not None:
+            self.columns.extend(other.columns)
+
+        if self.top_k is None:
+            for message, count in other.error_counts.items():
+                self.error_counts[message] = self.error_counts.get(message, 0) + count
+        else:
+            # Standard Space-Saving merge: a message missing from a full summary may
+            # have had up to that summary's smallest count, so add it as error
+            own_min = min(self.error_counts.values()) \
+                if len(self.error_counts) >= self.top_k else 0
+            other_min = min(other.error_counts.values()) \
+                if len(other.error_counts) >= other.top_k else 0
+
+            merged = {}
+            for message in list(self.error_counts) + list(other.error_counts):
+                if message in merged:
+                    continue
+                count = self.error_counts.get(message, own_min) + \
+                    other.error_counts.get(message, other_min)
+                error = self.error_bounds.get(message, own_min) + \
+                    other.error_bounds.get(message, other_min)
+                merged[message] = (count, error)
+
+            # Keep the top_k largest counts
+            keep = sorted(merged.items(), key=lambda item: item[1][0],
+                          reverse=True)[:self.top_k]
+            self.error_counts = {message: count for message, (count, _) in keep}
+            self.error_bounds = {message: error for message, (_, error) in keep}
+            self._rebuild_heap()
+
+        if self.histogram is not None and other.histogram is not None:
+            for label, levels in other.histogram.items():
+                target_levels = self.histogram.setdefault(label, {})
+                for level, messages in levels.items():
+                    target = target_levels.setdefault(level, {})
+                    for message, count in messages.items():
+                        target[message] = target.get(message, 0) + count
+
+    def to_json(self):
+        """Return the data written to error_summary.json."""
+        error_counts = self.error_counts
+        if self.top_k is not None:
+            # Most frequent first; the bounds go to a separate file (top_k_json)
+            error_counts = dict(sorted(error_counts.items(), key=lambda item: item[1],
+                                       reverse=True))
+        if self.histogram is None and self.file_stats is None:
+            # With no extra sections the summary keeps its original flat shape
+            return error_counts
+
+        data = {}
+        if self.histogram is not None:
+            data["bucket"] = self.bucket
+        data["error_counts"] = error_counts
+        if self.histogram is not None:
+            data["histogram"] = self.histogram
+        if self.file_stats is not None:
+            data["stats"] = self.file_stats
+        return data
+
+    def top_k_json(self):
+        """
+        Return the top-K details written next to the summary (see top_k_path),
+        or None without top_k: how many errors were seen in total and how much
+        each count may be over-estimated by.
+        """
+        if self.top_k is None:
+            return None
+        messages = sorted(self.error_counts, key=self.error_counts.get, reverse=True)
+        return {
+            "top_k": self.top_k,
+            "total_errors": self.total_errors,
+            "error_bounds": {message: self.error_bounds[message] for message in messages},
+        }
+
+    def to_checkpoint(self):
+        """Return the fields saved in a checkpoint."""
+        return {
+            **self.settings,
+            "total_errors": self.total_errors,
+            "error_counts": self.error_counts,
+            "error_bounds": self.error_bounds,
+            "histogram": self.histogram,
+        }
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint):
+        """Rebuild a summary from the fields saved by to_checkpoint()."""
+        summary = cls(checkpoint.get("bucket"), checkpoint.get("top_k"),
+                      checkpoint.get("templates", False))
+        summary.error_counts = checkpoint["error_counts"]
+        summary.total_errors = checkpoint.get(
+            "total_errors", sum(summary.error_counts.values()))
+        if summary.bucket is not None:
+            summary.histogram = checkpoint.get("histogram") or {}
+        if summary.top_k is not None:
+            summary.error_bounds = checkpoint.get("error_bounds") or {}
+            summary._rebuild_heap()
+        return summary
+
+
+def find_chunk_ranges(server_log_path, chunk_count):
+    """
+    Split the server log into byte ranges that start and end on line boundaries.
+    Args:
+        server_log_path (Path): Path to the input server log file.
+        chunk_count (int): Number of ranges to aim for.
+    Returns:
+        list: A list of (start, end) byte offsets covering the whole file in order.
+    """
+    file_size = os.path.getsize(server_log_path)
+    if file_size == 0:
+        return []
+
+    chunk_size = max(1, file_size // chunk_count)
+    ranges = []
+    start = 0
+
+    with open(server_log_path, "rb") as src:
+        while start < file_size:
+            # Jump roughly one chunk ahead, then move forward to the end of that line
+            # so no line is ever split between two chunks
+            end = start + chunk_size
+            if end >= file_size:
+                end = file_size
+            else:
+                src.seek(end)
+                src.readline()  # Read the rest of the current line
+                end = src.tell()
+
+            ranges.append((start, end))
+            start = end
+
+    return ranges
+
+
+def record_line(raw_line, err_out, summary):
+    """
+    Decode and count one raw line, writing it to errors.log if it is an ERROR.
+    Args:
+        raw_line (bytes): A line read from the server log in binary mode.
+        err_out (file): Text file that receives the full ERROR lines.
+        summary (LogSummary): Running totals, updated in place.
+    """
+    # Decode and strip whitespace, skipping empty lines like the serial path
+    line = raw_line.decode("utf-8").strip()
+    if line and summary.add(line):
+        err_out.write(line + "\n")
+
+
+def scan_log_range(src, start, end, err_out, summary, complete_only=False):
+    """
+    Scan whole lines between two byte offsets of an open server log.
+    Args:
+        src (file): The server log opened in binary mode.
+        start (int): Byte offset of the first line to read.
+        end (int): Byte offset just after the last line to read.
+        err_out (file): Text file that receives the full ERROR lines.
+        summary (LogSummary): Running totals, updated in place.
+        complete_only (bool): Stop at a last line without a newline, because the
+            writer may still be in the middle of it.
+    Returns:
+        int: Byte offset just after the last line that was counted.
+    """
+    src.seek(start)
+    offset = start
+
+    # Read whole lines until the end of this range is reached
+    while offset < end:
+        raw_line = src.readline()
+        if not raw_line:
+            break
+        if complete_only and not raw_line.endswith(b"\n"):
+            break  # Unfinished line: leave it for the next run
+
+        record_line(raw_line, err_out, summary)
+        offset += len(raw_line)
+
+    return offset
+
+
+def process_log_chunk(server_log_path, start, end, part_path, settings):
+    """
+    Process one byte range of the server log (runs inside a worker process).
+    Args:
+        server_log_path (Path): Path to the input server log file.
+        start (int): Byte offset of the first line in the range.
+        end (int): Byte offset just after the last line in the range.
+        part_path (Path): Path to the temporary file for this range's error lines.
+        settings (dict): Keyword arguments for the chunk's LogSummary.
+    Returns:
+        LogSummary: The totals for this range.
+    """
+    summary = LogSummary(**settings)
+
+    with open(server_log_path, "rb") as src, \
+            open(part_path, "w", encoding="utf-8") as err_out:
+        scan_log_range(src, start, end, err_out, summary)
+
+    return summary
+
+
+def process_log_file_serial(server_log_path, errors_log_path, summary):
+    """
+    Process the server log one line at a time on a single core.
+    Args:
+        server_log_path (Path): Path to the input server log file.
+        errors_log_path (Path): Path to the output file for error messages.
+        summary (LogSummary): Running totals, updated in place.
+    """
+
+    # Open the server log file for reading and the errors log file for writing.
+    # newline="\n" splits lines only on \n, like the parallel, mmap and follow
+    # paths that read bytes, so a stray \r can't make them count different lines
+    # (a \r before the \n of Windows line endings is removed by strip())
+    with open(server_log_path, "r", encoding="utf-8", newline="\n") as src, \
+            open(errors_log_path, "w", encoding="utf-8") as err_out:
+
+        # Read the server log file line by line
+        for line in src:
+            # Strip whitespace and skip empty lines
+            line = line.strip()
+            if not line:
+                continue
+
+            if summary.add(line):
+                # Write full error line
+                err_out.write(line + "\n")
+
+
+def process_log_file_mmap(server_log_path, errors_log_path, summary):
+    """
+    Process the server log by memory-mapping it and searching the raw bytes.
+    Only lines that contain the ERROR marker are decoded, so INFO and WARNING lines
+    never become Python strings.
+    Args:
+        server_log_path (Path): Path to the input server log file.
+        errors_log_path (Path): Path to the output file for error messages.
+        summary (LogSummary): Running totals (without a histogram), updated in place.
+    """
+    marker = b" ERROR "  # Every line whose level field is ERROR contains this
+
+    with open(server_log_path, "rb") as src, \
+            open(errors_log_path, "w", encoding="utf-8") as err_out:
+        # mmap cannot map an empty file, and an empty file has no errors anyway
+        if os.fstat(src.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            pos = data.find(marker)
+            while pos != -1:
+                # Widen the match out to the full line it belongs to
+                line_start = data.rfind(b"\n", 0, pos) + 1
+                line_end = data.find(b"\n", pos)
+                if line_end == -1:
+                    line_end = len(data)
+
+                # The marker could also appear inside a message, so the decoded line
+                # is still checked with the same parser as the text loop
+                line = data[line_start:line_end].decode("utf-8").strip()
+                if summary.add(line):
+                    err_out.write(line + "\n")
+
+                # Carry on searching after this line so it is never counted twice
+                pos = data.find(marker, line_end)
+
+
+def process_log_file_parallel(server_log_path, errors_log_path, summary, workers):
+    """
+    Process the server log in newline-aligned chunks using a process pool.
+    Args:
+        server_log_path (Path): Path to the input server log file.
+        errors_log_path (Path): Path to the output file for error messages.
+        summary (LogSummary): Running totals, updated in place.
+        workers (int): Number of worker processes to use.
+    """
+    ranges = find_chunk_ranges(server_log_path, workers)
+
+    # Each chunk writes its error lines to its own part file, which are then joined
+    # back together in chunk order so errors.log keeps the original line order
+    with tempfile.TemporaryDirectory(dir=Path(errors_log_path).parent) as tmp_dir:
+        part_paths = [Path(tmp_dir) / f"part_{i}.log" for i in range(len(ranges))]
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(process_log_chunk, server_log_path, start, end, part,
+                            summary.settings)
+                for (start, end), part in zip(ranges, part_paths)
+            ]
+            # Results are collected in submission (file) order, not completion order
+            chunk_summaries = [future.result() for future in futures]
+
+        # Merge the per-chunk totals in file order so the first time a message
+        # appears decides its position, exactly like the serial loop
+        for chunk_summary in chunk_summaries:
+            summary.merge(chunk_summary)
+
+        with open(errors_log_path, "w", encoding="utf-8") as err_out:
+            for part in part_paths:
+                with open(part, "r", encoding="utf-8") as part_file:
+                    shutil.copyfileobj(part_file, err_out)
+
+
+def load_checkpoint(checkpoint_path):
+    """Load the checkpoint dictionary, or None if there is no usable checkpoint."""
+    try:
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    # Ignore checkpoints that are missing any of the fields we rely on
+    if not {"offset", "inode", "error_counts"} <= checkpoint.keys():
+        return None
+    return checkpoint
+
+
+def save_checkpoint(checkpoint_path, checkpoint):
+    """Write the checkpoint via a temporary file so a crash never leaves half a file."""
+    tmp_path = Path(f"{checkpoint_path}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=4)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def process_log_file_incremental(server_log_path, errors_log_path, checkpoint_path,
+                                 settings):
+    """
+    Process only the bytes appended to the server log since the last run.
+    Falls back to a full scan when there is no checkpoint, or when the log has been
+    rotated (new inode) or truncated (smaller than the saved offset).
+    Args:
+        server_log_path (Path): Path to the input server log file.
+        errors_log_path (Path): Path to the output file for error messages.
+        checkpoint_path (Path): Path to the JSON checkpoint file.
+        settings (dict): Keyword arguments for the LogSummary.
+    Returns:
+        LogSummary: The totals for the whole log so far.
+    """
+    checkpoint = load_checkpoint(checkpoint_path)
+
+    with open(server_log_path, "rb") as src:
+        stat = os.fstat(src.fileno())
+
+        resume = (
+            checkpoint is not None
+            and checkpoint["inode"] == stat.st_ino
+            and checkpoint["offset"] <= stat.st_size
+            and all(checkpoint.get(key) == value for key, value in settings.items())
+            and Path(errors_log_path).exists()
+        )
+        if resume:
+            # Carry on from where the last run stopped, appending to errors.log
+            start = checkpoint["offset"]
+            summary = LogSummary.from_checkpoint(checkpoint)
+            errors_mode = "a"
+        else:
+            # First run, rotated or truncated log, or different settings:
+            # start again from byte 0
+            start = 0
+            summary = LogSummary(**settings)
+            errors_mode = "w"
+
+        # Stop at the size seen now so lines written during the scan wait for next run.
+        # The log may still be growing, so only lines ending in a newline are counted
+        # and the checkpoint points at the start of any unfinished last line.
+        with open(errors_log_path, errors_mode, encoding="utf-8") as err_out:
+            offset = scan_log_range(src, start, stat.st_size, err_out, summary,
+                                    complete_only=True)
+
+    save_checkpoint(checkpoint_path, {
+        "offset": offset,
+        "inode": stat.st_ino,
+        **summary.to_checkpoint(),
+    })
+    return summary
+
+
+def top_k_path(summary_json_path):
+    """Return the file for the top-K details, e.g. error_summary_top_k.json."""
+    path = Path(summary_json_path)
+    return path.with_name(f"{path.stem}_top_k{path.suffix}")
+
+
+def write_summary(summary_json_path, summary):
+    """
+    Write the totals to the summary JSON file. In top-K mode the summary keeps
+    the usual message -> count shape, and the totals and error bounds are
+    written to a second file next to it (see top_k_path).
+    """
+    with open(summary_json_path, "w", encoding="utf-8") as f:
+        # Convert dictionary to JSON string and save
+        json.dump(summary.to_json(), f, indent=4)
+
+    top_k_data = summary.top_k_json()
+    if top_k_data is not None:
+        with open(top_k_path(summary_json_path), "w", encoding="utf-8") as f:
+            json.dump(top_k_data, f, indent=4)
+
+
+def process_log_file(server_log_path, errors_log_path, summary_json_path, workers=1,
+                     backend="text", checkpoint_path=None, bucket=None, top_k=None,
+                     templates=False, columns_path=None):
     """
     Process the server log file to extract error messages, write them to 
     a new file, and create a summary JSON file with error counts.
@@ -11,63 +814,475 @@ def process_log_file(server_log_path, errors_log_path, summary_json_path):
         server_log_path (Path): Path to the input server log file.
         errors_log_path (Path): Path to the output file for error messages.
         summary_json_path (Path): Path to the output JSON file for error summary.
+        workers (int): Number of worker processes. Values above 1 split the file into
+            chunks that are processed in parallel.
+        backend (str): "text" to read the file line by line, or "mmap" to scan the
+            memory-mapped bytes and only decode ERROR lines.
+        checkpoint_path (Path): If given, only lines appended since the last run are
+            processed and merged into the saved counts.
+        bucket (str): "minute", "hour" or "day" to add per-bucket counts for every
+            level and message to the summary JSON, or None for the flat summary.
+        top_k (int): If given, only track the top_k most frequent messages in fixed
+            memory. Counts become upper bounds; the totals and error bounds are
+            written next to the summary, e.g. to error_summary_top_k.json.
+        templates (bool): Count messages by template, with numbers, IDs and
+            addresses replaced by placeholders such as <NUM>.
+        columns_path (Path): If given, also write the ERROR records to this binary
+            columnar file (see ErrorColumnReader).
     Returns:
           dict: A dictionary with error messages as keys and their counts as values.
     """
-    error_counts = {}  # Dictionary to hold error message as key and count as value
+    if backend == "mmap" and bucket is not None:
+        # The mmap scan never looks at INFO/WARNING lines, so it can't bucket them
+        raise ValueError("Time buckets need the text backend.")
+    if checkpoint_path is not None and columns_path is not None:
+        # The columnar file is written in one go, it can't be appended to
+        raise ValueError("Columnar output can't be combined with incremental mode.")
+
+    summary = LogSummary(bucket, top_k, templates, columns_path is not None)
 
     try:
-        # Open the server log file for reading and the errors log file for writing
-        with open(server_log_path, "r", encoding="utf-8") as src, \
-                open(errors_log_path, "w", encoding="utf-8") as err_out:
-
-            # Read the server log file line by line
-            for line in src:
-                # Strip whitespace and skip empty lines
-                line = line.strip()
-                if not line:
-                    continue
+        if checkpoint_path is not None:
+            # Incremental mode: pick up from the saved byte offset
+            summary = process_log_file_incremental(
+                server_log_path, errors_log_path, checkpoint_path, summary.settings)
+        elif backend == "mmap":
+            # Zero-copy scan: only the ERROR lines are ever decoded
+            process_log_file_mmap(server_log_path, errors_log_path, summary)
+        elif workers > 1:
+            # Parallel mode: same results as the serial loop below, spread across cores
+            process_log_file_parallel(
+                server_log_path, errors_log_path, summary, workers)
+        else:
+            process_log_file_serial(server_log_path, errors_log_path, summary)
 
-                # Format: DATE TIME LEVEL MESSAGE
-                # Split into 4 parts: date, time, level, and message
-                parts = line.split(" ", 3)
-                if len(parts) < 4:  # If the line doesn't have enough parts, skip it
-                    continue
+        write_summary(summary_json_path, summary)
+        if columns_path is not None:
+            summary.columns.write(columns_path)
+        return summary.error_counts
 
-                # Unpack the parts into variables
-                level = parts[2]
-                message = parts[3]
+    except IOError as e:
+        print(f"IOError: {e}")
+        return None
 
-                if level == "ERROR":
-                    # Write full error line
-                    err_out.write(line + "\n")
 
-                    # Count the message only
-                    error_counts[message] = error_counts.get(message, 0) + 1
+def expand_log_paths(server_log_paths):
+    """
+    Turn a glob pattern or a list of paths/patterns into an ordered list of files.
+    Rotated files from a pattern are put oldest first (server.log.30.gz before
+    server.log.1 before server.log) so errors.log stays in time order.
+    Args:
+        server_log_paths (str | Path | list): A glob pattern, a path, or a list.
+    Returns:
+        list: The matching file paths.
+    """
+    if isinstance(server_log_paths, (str, Path)):
+        server_log_paths = [server_log_paths]
+
+    def rotation_number(path):
+        # "server.log.12.gz" -> 12, "server.log" -> 0
+        for part in reversed(Path(path).name.split(".")):
+            if part.isdigit():
+                return int(part)
+        return 0
+
+    paths = []
+    for pattern in server_log_paths:
+        matches = glob.glob(str(pattern))
+        if not matches:
+            paths.append(Path(pattern))  # Let opening it report the missing file
+            continue
+        matches.sort(key=lambda match: (-rotation_number(match), match))
+        paths.extend(Path(match) for match in matches)
+    return paths
+
+
+def open_log(server_log_path):
+    """Open a plain, .gz, .bz2 or .xz log as bytes, decompressing on the fly."""
+    suffix = Path(server_log_path).suffix
+    if suffix == ".gz":
+        return gzip.open(server_log_path, "rb")
+    if suffix == ".bz2":
+        return bz2.open(server_log_path, "rb")
+    if suffix == ".xz":
+        return lzma.open(server_log_path, "rb")
+    return open(server_log_path, "rb")
+
 
-        # Write summary JSON
-        with open(summary_json_path, "w", encoding="utf-8") as f:
-            # Convert dictionary to JSON string and save
-            json.dump(error_counts, f, indent=4)
+def process_one_log(server_log_path, part_path, settings):
+    """
+    Process one (possibly compressed) log file, streaming it line by line.
+    Args:
+        server_log_path (Path): Path to the log file.
+        part_path (Path): Path to the temporary file for this file's error lines.
+        settings (dict): Keyword arguments for the file's LogSummary.
+    Returns:
+        tuple: (LogSummary for the file, throughput stats dictionary).
+    """
+    summary = LogSummary(**settings)
+    size = 0
+    lines = 0
+    start = time.perf_counter()
 
-        return error_counts
+    with open_log(server_log_path) as src, \
+            open(part_path, "w", encoding="utf-8") as err_out:
+        for raw_line in src:
+            size += len(raw_line)
+            lines += 1
+            record_line(raw_line, err_out, summary)
+
+    seconds = time.perf_counter() - start
+    stats = {
+        "path": str(server_log_path),
+        "file_bytes": os.path.getsize(server_log_path),
+        "bytes": size,  # After decompression
+        "lines": lines,
+        "seconds": round(seconds, 3),
+        "mb_per_s": round(size / 1024 / 1024 / seconds, 2) if seconds else None,
+    }
+    return summary, stats
+
+
+def process_log_files(server_log_paths, errors_log_path, summary_json_path, workers=1,
+                      bucket=None, top_k=None, templates=False, columns_path=None):
+    """
+    Process several log files, plain or compressed, into one errors.log and summary.
+    Files are read in parallel (one file per worker process) and merged in order.
+    The summary JSON gains a "stats" section with each file's throughput.
+    Args:
+        server_log_paths (str | list): A glob pattern such as "server.log*", or a
+            list of paths. .gz, .bz2 and .xz files are decompressed while streaming.
+        errors_log_path (Path): Path to the output file for error messages.
+        summary_json_path (Path): Path to the output JSON file for error summary.
+        workers (int): Number of files to process at the same time.
+        bucket (str): Histogram bucket size, or None for no histogram.
+        top_k (int): Only track this many of the most frequent messages.
+        templates (bool): Count messages by template instead of exact text.
+        columns_path (Path): If given, also write the ERROR records to this binary
+            columnar file.
+    Returns:
+        dict: A dictionary with error messages as keys and their counts as values.
+    """
+    summary = LogSummary(bucket, top_k, templates, columns_path is not None)
+
+    try:
+        paths = expand_log_paths(server_log_paths)
+        started = time.perf_counter()
+
+        with tempfile.TemporaryDirectory(dir=Path(errors_log_path).parent) as tmp_dir:
+            part_paths = [Path(tmp_dir) / f"part_{i}.log" for i in range(len(paths))]
+
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = [
+                        pool.submit(process_one_log, path, part, summary.settings)
+                        for path, part in zip(paths, part_paths)
+                    ]
+                    results = [future.result() for future in futures]
+            else:
+                results = [process_one_log(path, part, summary.settings)
+                           for path, part in zip(paths, part_paths)]
+
+            # Merge in file order, the same way as the parallel chunks
+            file_stats = []
+            for file_summary, stats in results:
+                summary.merge(file_summary)
+                file_stats.append(stats)
+
+            with open(errors_log_path, "w", encoding="utf-8") as err_out:
+                for part in part_paths:
+                    with open(part, "r", encoding="utf-8") as part_file:
+                        shutil.copyfileobj(part_file, err_out)
+
+        # Overall throughput uses wall-clock time, so it shows the parallel speed-up
+        total_bytes = sum(stats["bytes"] for stats in file_stats)
+        total_seconds = time.perf_counter() - started
+        summary.file_stats = {
+            "files": file_stats,
+            "total_bytes": total_bytes,
+            "total_lines": sum(stats["lines"] for stats in file_stats),
+            "seconds": round(total_seconds, 3),
+            "mb_per_s": round(total_bytes / 1024 / 1024 / total_seconds, 2),
+        }
+
+        write_summary(summary_json_path, summary)
+        if columns_path is not None:
+            summary.columns.write(columns_path)
+        return summary.error_counts
+
+    except IOError as e:
+        print(f"IOError: {e}")
+        return None
+
+
+def open_inotify(server_log_path):
+    """
+    Start watching the directory that holds the server log with Linux inotify.
+    The directory is watched rather than the file so rotation (the file being
+    moved away and recreated) is noticed too.
+    Returns:
+        int: The inotify file descriptor, or None if inotify is not available.
+    """
+    libc_name = ctypes.util.find_library("c")
+    if libc_name is None:
+        return None
+    libc = ctypes.CDLL(libc_name, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        return None  # Not Linux (e.g. macOS or Windows)
+
+    fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        return None
+
+    mask = IN_MODIFY | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+    watch_dir = os.fsencode(Path(server_log_path).resolve().parent)
+    if libc.inotify_add_watch(fd, watch_dir, mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def wait_for_log_event(inotify_fd, log_name, timeout):
+    """
+    Sleep until the server log changes or the timeout runs out.
+    Args:
+        inotify_fd (int): File descriptor from open_inotify().
+        log_name (str): File name of the server log inside the watched directory.
+        timeout (float): Seconds to wait, or None to wait forever.
+    Returns:
+        bool: True if an event for the server log was seen.
+    """
+    # select() blocks in the kernel, so an idle log costs no CPU at all
+    ready, _, _ = select.select([inotify_fd], [], [], timeout)
+    if not ready:
+        return False
+
+    # Drain every queued event and check whether any of them name the server log;
+    # writes to errors.log in the same directory are ignored
+    target = os.fsencode(log_name)
+    seen = False
+    while True:
+        try:
+            data = os.read(inotify_fd, 64 * 1024)
+        except BlockingIOError:
+            break
+        offset = 0
+        while offset < len(data):
+            _, _, _, name_len = INOTIFY_EVENT.unpack_from(data, offset)
+            name_start = offset + INOTIFY_EVENT.size
+            name = data[name_start:name_start + name_len].rstrip(b"\0")
+            if name == target:
+                seen = True
+            offset = name_start + name_len
+    return seen
+
+
+def read_new_lines(src, pending, err_out, summary):
+    """
+    Read whatever has been appended to the log and process the complete lines.
+    Args:
+        src (file): The server log opened in binary mode.
+        pending (bytes): Start of a line that was still being written last time.
+        err_out (file): Text file that receives the full ERROR lines.
+        summary (LogSummary): Running totals, updated in place.
+    Returns:
+        tuple: (bytes read, the new incomplete tail to keep for next time).
+    """
+    total = 0
+    # Read in fixed-size chunks, so catching up on a multi-GB log on start-up
+    # never holds more than one chunk (plus one unfinished line) in memory
+    while True:
+        data = src.read(FOLLOW_CHUNK_SIZE)
+        if not data:
+            break
+        total += len(data)
+
+        # Anything after the last newline isn't a full line yet, so keep it back
+        *lines, pending = (pending + data).split(b"\n")
+        for raw_line in lines:
+            record_line(raw_line, err_out, summary)
+
+    if total:
+        # Flush so new errors show up in errors.log straight away
+        err_out.flush()
+    return total, pending
+
+
+def check_log_replaced(server_log_path, src):
+    """
+    Check whether the log at server_log_path is still the file we have open.
+    Returns:
+        str: "rotated" if a new file now has that name, "truncated" if the open file
+            shrank below our read position, otherwise None.
+    """
+    try:
+        current = os.stat(server_log_path)
+    except FileNotFoundError:
+        return None  # The old file has moved and the new one isn't there yet
+
+    if current.st_ino != os.fstat(src.fileno()).st_ino:
+        return "rotated"
+    if current.st_size < src.tell():
+        return "truncated"
+    return None
+
+
+def follow_log_file(server_log_path, errors_log_path, summary_json_path,
+                    summary_interval=5.0, poll_min=0.05, poll_max=2.0, duration=None,
+                    bucket=None, top_k=None, templates=False):
+    """
+    Process the server log, then keep watching it like `tail -f`.
+    New ERROR lines are streamed to errors.log as they arrive, and the summary JSON
+    is refreshed at most once every summary_interval seconds. Uses inotify on Linux
+    and falls back to polling that backs off while the log is idle.
+    Args:
+        server_log_path (Path): Path to the input server log file.
+        errors_log_path (Path): Path to the output file for error messages.
+        summary_json_path (Path): Path to the output JSON file for error summary.
+        summary_interval (float): Minimum seconds between summary rewrites.
+        poll_min (float): Shortest polling delay when inotify is unavailable.
+        poll_max (float): Longest polling delay when inotify is unavailable.
+        duration (float): Stop after this many seconds, or None to run until Ctrl+C.
+        bucket (str): Histogram bucket size, or None for the flat summary.
+        top_k (int): Only track this many of the most frequent messages.
+        templates (bool): Count messages by template instead of exact text.
+    Returns:
+        dict: A dictionary with error messages as keys and their counts as values.
+    """
+    summary = LogSummary(bucket, top_k, templates)
+    pending = b""
+    dirty = True  # The summary needs writing
+    last_summary = 0.0
+    poll_delay = poll_min
+    started = time.monotonic()
+    log_name = Path(server_log_path).name
+    inotify_fd = open_inotify(server_log_path)
+
+    try:
+        src = open(server_log_path, "rb")
+        with open(errors_log_path, "w", encoding="utf-8") as err_out:
+            try:
+                while True:
+                    got, pending = read_new_lines(src, pending, err_out, summary)
+                    if got:
+                        dirty = True
+                        poll_delay = poll_min
+
+                    # Handle rotation (a new file under the same name) and truncation
+                    change = check_log_replaced(server_log_path, src)
+                    if change == "rotated":
+                        # Finish the old file, then start on the new one from byte 0
+                        _, pending = read_new_lines(src, pending, err_out, summary)
+                        record_line(pending, err_out, summary)
+                        src.close()
+                        src = open(server_log_path, "rb")
+                        pending = b""
+                        continue
+                    if change == "truncated":
+                        src.seek(0)
+                        pending = b""
+                        continue
+
+                    now = time.monotonic()
+                    if dirty and now - last_summary >= summary_interval:
+                        write_summary(summary_json_path, summary)
+                        last_summary = now
+                        dirty = False
+
+                    if duration is not None and now - started >= duration:
+                        break
+
+                    # Work out how long we may sleep: until the next summary is due,
+                    # until the run ends, or (with inotify) until the log changes
+                    timeouts = []
+                    if dirty:
+                        timeouts.append(last_summary + summary_interval - now)
+                    if duration is not None:
+                        timeouts.append(started + duration - now)
+
+                    if inotify_fd is not None:
+                        timeout = max(0.0, min(timeouts)) if timeouts else None
+                        wait_for_log_event(inotify_fd, log_name, timeout)
+                    else:
+                        time.sleep(max(0.0, min([poll_delay] + timeouts)))
+                        if not got:
+                            # Nothing new: wait twice as long next time, up to poll_max
+                            poll_delay = min(poll_delay * 2, poll_max)
+            except KeyboardInterrupt:
+                pass  # Ctrl+C is the normal way to stop following
+
+            # A last line without a trailing newline still counts once we stop
+            record_line(pending, err_out, summary)
+            src.close()
+
+        # Always leave an up-to-date summary behind when stopping
+        write_summary(summary_json_path, summary)
+        return summary.error_counts
 
     except IOError as e:
         print(f"IOError: {e}")
         return None
 
+    finally:
+        if inotify_fd is not None:
+            os.close(inotify_fd)
+
 
 def main():
     """Main function to execute the log processing."""
+    parser = argparse.ArgumentParser(description="Extract and count ERROR lines.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes (default: 1, serial)")
+    parser.add_argument("--backend", choices=["text", "mmap"], default="text",
+                        help="how to read server.log (default: text)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only process lines appended since the last run")
+    parser.add_argument("--follow", action="store_true",
+                        help="keep watching server.log for new errors (Ctrl+C to stop)")
+    parser.add_argument("--summary-interval", type=float, default=5.0,
+                        help="seconds between summary refreshes in follow mode")
+    parser.add_argument("--bucket", choices=list(BUCKET_FORMATS),
+                        help="add per-minute/hour/day counts to the summary")
+    parser.add_argument("--top-k", type=int,
+                        help="only track the K most frequent errors (fixed memory)")
+    parser.add_argument("--templates", action="store_true",
+                        help="count messages by template, e.g. user_id=<NUM>")
+    parser.add_argument("--inputs", nargs="+",
+                        help="log files or glob patterns to read instead of server.log "
+                             "(.gz, .bz2 and .xz are supported)")
+    parser.add_argument("--columns", action="store_true",
+                        help="also write the errors to the binary columnar errors.bin")
+    args = parser.parse_args()
+
     base_dir = Path(__file__).parent
 
     # Define paths for I/O files in the same directory as the script
     server_log = base_dir / "server.log"
     errors_log = base_dir / "errors.log"
     summary_json = base_dir / "error_summary.json"
+    checkpoint = base_dir / "log_checkpoint.json" if args.incremental else None
+    columns = base_dir / "errors.bin" if args.columns else None
 
-    # Process the log file and get the error counts
-    result = process_log_file(server_log, errors_log, summary_json)
+    if args.inputs:
+        # Several (possibly compressed) files merged into one summary
+        result = process_log_files(args.inputs, errors_log, summary_json,
+                                   workers=args.workers, bucket=args.bucket,
+                                   top_k=args.top_k, templates=args.templates,
+                                   columns_path=columns)
+    elif args.follow:
+        # Follow mode runs until Ctrl+C, then prints the final counts below
+        print(f"Following {server_log.name}... press Ctrl+C to stop.")
+        result = follow_log_file(server_log, errors_log, summary_json,
+                                 summary_interval=args.summary_interval,
+                                 bucket=args.bucket, top_k=args.top_k,
+                                 templates=args.templates)
+    else:
+        # Process the log file and get the error counts
+        result = process_log_file(server_log, errors_log, summary_json,
+                                  workers=args.workers, backend=args.backend,
+                                  checkpoint_path=checkpoint, bucket=args.bucket,
+                                  top_k=args.top_k, templates=args.templates,
+                                  columns_path=columns)
 
     # If processing was successful, print the results
     if result is not None:
@@ -106,3 +1321,14 @@ if __name__ == "__main__":
 #     "Database connection failed": 3,
 #     "Invalid API key provided": 1
 # }
+
+# ? With --top-k 2, error_summary.json keeps the same shape (most frequent first)
+# ? and error_summary_top_k.json holds the extra details:
+# {
+#     "top_k": 2,
+#     "total_errors": 4,
+#     "error_bounds": {
+#         "Database connection failed": 0,
+#         "Invalid API key provided": 0
+#     }
+# }
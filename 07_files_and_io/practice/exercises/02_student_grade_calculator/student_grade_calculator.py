@@ -1,11 +1,48 @@
 """Exercise 2: Student Grade Calculator"""
 from pathlib import Path
-
-
-def read_grades_from_file(file_path):
-    """Read grades from a grades.txt file and return a list of grades."""
+import math
+
+
+class GradeStatistics:
+    """
+    Running count, mean, variance, minimum and maximum of the grades added so
+    far. Uses Welford's method, so the grades are seen once and never stored:
+    memory stays the same however big the grades file is, and the variance does
+    not lose precision the way sum(x*x)/n - mean**2 does for large files.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # Sum of squared differences from the current mean
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, grade):
+        """Include one grade in the statistics."""
+        self.count += 1
+        delta = grade - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (grade - self.mean)  # Uses the old and the new mean
+        if self.minimum is None or grade < self.minimum:
+            self.minimum = grade
+        if self.maximum is None or grade > self.maximum:
+            self.maximum = grade
+
+    @property
+    def variance(self):
+        """Population variance of the grades (0.0 until there are any)."""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def standard_deviation(self):
+        """Population standard deviation of the grades."""
+        return math.sqrt(self.variance)
+
+
+def iter_grades_from_file(file_path):
+    """Yield the grades in a grades.txt file one at a time, without keeping them."""
     # each line has name then comma then grade
-    grades = []
     with open(file_path, 'r', encoding='utf-8') as file:
         for line in file:
             # strip whitespace and split by comma
@@ -15,13 +52,18 @@ def read_grades_from_file(file_path):
                 # unpack name and grade
                 name, grade_str = parts
                 try:
-                    # convert grade to float and add to list
+                    # convert grade to float
                     grade = float(grade_str)
-                    grades.append(grade)
                 except ValueError:
                     print(
                         f"Warning: '{grade_str}' is not a valid grade and will be skipped.")
-    return grades
+                    continue
+                yield grade
+
+
+def read_grades_from_file(file_path):
+    """Read grades from a grades.txt file and return a list of grades."""
+    return list(iter_grades_from_file(file_path))
 
 
 def calculate_average_grade(grades):
@@ -33,12 +75,32 @@ def calculate_average_grade(grades):
     return average
 
 
+def calculate_grade_statistics(grades):
+    """Calculate GradeStatistics in one pass over any iterable of grades."""
+    statistics = GradeStatistics()
+    for grade in grades:
+        statistics.add(grade)
+    return statistics
+
+
 def write_average_to_file(average, file_path):
     """Write the average grade to a file named average_grade.txt."""
     with open(file_path, 'w', encoding='utf-8') as file:
         file.write(f"Average Grade: {average:.2f}\n")
 
 
+def write_statistics_to_file(statistics, file_path):
+    """Write the average grade and the other statistics to average_grade.txt."""
+    with open(file_path, 'w', encoding='utf-8') as file:
+        file.write(f"Average Grade: {statistics.mean:.2f}\n")
+        file.write(f"Number of Grades: {statistics.count}\n")
+        if statistics.count:  # No minimum or maximum for an empty file
+            file.write(f"Lowest Grade: {statistics.minimum:.2f}\n")
+            file.write(f"Highest Grade: {statistics.maximum:.2f}\n")
+        file.write(f"Variance: {statistics.variance:.2f}\n")
+        file.write(f"Standard Deviation: {statistics.standard_deviation:.2f}\n")
+
+
 def main():
     """Main function to read grades, calculate average, and write to file."""
 
@@ -47,16 +109,14 @@ def main():
     grades_file = base_dir / 'grades.txt'
     output_file = base_dir / 'average_grade.txt'
 
-    # Read grades from file
-    grades = read_grades_from_file(grades_file)
-
-    # Calculate average grade
-    average_grade = calculate_average_grade(grades)
+    # Read the grades one at a time and update the statistics as we go,
+    # so even a huge grades file is never held in memory
+    statistics = calculate_grade_statistics(iter_grades_from_file(grades_file))
 
-    # Write average grade to file
-    write_average_to_file(average_grade, output_file)
+    # Write the average grade and the other statistics to file
+    write_statistics_to_file(statistics, output_file)
 
-    print(f"Average grade calculated and written to {output_file}.")
+    print(f"Grade statistics calculated and written to {output_file}.")
 
 
 if __name__ == "__main__":
@@ -65,3 +125,8 @@ if __name__ == "__main__":
 
 # ? Output in average_grade.txt:
 # ? Average Grade: 82.00
+# ? Number of Grades: 5
+# ? Lowest Grade: 65.00
+# ? Highest Grade: 92.00
+# ? Variance: 95.60
+# ? Standard Deviation: 9.78
@@ -0,0 +1,133 @@
+"""Stress test: many processes adding stock to one inventory.json at the same time"""
+from multiprocessing import Process
+from pathlib import Path
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+
+from inventory_management_system import InventoryJournal, add_item, load_inventory
+
+
+def open_session(file_path, compact):
+    """Load the inventory and start a journal, like main() does."""
+    inventory = load_inventory(file_path, compact=compact)
+    journal = InventoryJournal(file_path.with_suffix('.journal'), file_path)
+    journal.recover(inventory)
+    return inventory, journal
+
+
+def operator_session(file_path, worker_id, rounds, save_every, compact, crash):
+    """
+    Act like one operator: load the inventory once, add one unit of a random item
+    per round (journalled, like menu option 1) and save every save_every rounds,
+    while the other workers do the same. With crash, the worker dies after its
+    last round without saving, leaving its last changes only in its journal.
+    """
+    rng = random.Random(worker_id)
+    # The menu functions print; keep the terminal readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        inventory, journal = open_session(file_path, compact)
+        for round_number in range(1, rounds + 1):
+            # A few shared items (so workers collide) and one of their own
+            item_name = rng.choice(['Apple', 'Banana', 'Cherry', f'Worker {worker_id}'])
+            add_item(inventory, item_name, 1, 0.5)
+            journal.record(inventory, item_name)
+            if crash and round_number == rounds:
+                os._exit(0)  # No save, no cleanup: as if the power went off
+            if round_number % save_every == 0 or round_number == rounds:
+                if not journal.compact(inventory):
+                    raise SystemExit(f"worker {worker_id}: save failed")
+        journal.close()
+
+
+def run_stress_test(workers, rounds, save_every, compact=False, crashes=1):
+    """
+    Run the workers against a fresh inventory file and check nothing was lost.
+    The first crashes workers die without their final save; one more session is
+    opened afterwards to recover their journals, as the next user of the menu would.
+    Returns:
+        tuple: (expected total quantity, actual total quantity, seconds taken).
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = Path(tmp_dir) / 'inventory.json'
+        file_path.write_text("{}", encoding='utf-8')
+
+        start = time.perf_counter()
+        processes = [
+            Process(target=operator_session,
+                    args=(file_path, worker_id, rounds, save_every, compact,
+                          worker_id < crashes))
+            for worker_id in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        failed = [process.exitcode for process in processes if process.exitcode != 0]
+        if failed:
+            raise SystemExit(f"{len(failed)} worker(s) failed")
+
+        # The next session picks up what the crashed workers never saved
+        with contextlib.redirect_stdout(io.StringIO()):
+            inventory, journal = open_session(file_path, compact)
+            journal.close()
+        left_over = list(Path(tmp_dir).glob('inventory.journal*'))
+        if left_over:
+            raise SystemExit(f"{len(left_over)} journal(s) were not cleaned up")
+
+        with open(file_path, 'r', encoding='utf-8') as file:
+            inventory = json.load(file)  # Must still be valid JSON
+    actual = sum(details['quantity'] for details in inventory.values())
+    return workers * rounds, actual, elapsed
+
+
+def main():
+    """Parse the command line and run the stress test."""
+    parser = argparse.ArgumentParser(description="Inventory concurrency stress test")
+    parser.add_argument('--workers', type=int, default=16, help="processes (default 16)")
+    parser.add_argument('--rounds', type=int, default=200,
+                        help="items each process adds (default 200)")
+    parser.add_argument('--save-every', type=int, default=5,
+                        help="rounds between saves (default 5)")
+    parser.add_argument('--compact', action='store_true',
+                        help="use the array-backed inventory in the workers")
+    parser.add_argument('--crashes', type=int, default=1,
+                        help="workers that die before their final save (default 1)")
+    args = parser.parse_args()
+
+    expected, actual, elapsed = run_stress_test(
+        args.workers, args.rounds, args.save_every, args.compact, args.crashes)
+    print(f"{args.workers} workers x {args.rounds} additions in {elapsed:.2f} s")
+    print(f"Expected total quantity: {expected}")
+    print(f"Actual total quantity:   {actual}")
+    if actual != expected:
+        raise SystemExit(f"Lost {expected - actual} unit(s) of stock!")
+    print("No updates were lost.")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ? Example output:
+
+# $ python inventory_stress_test.py
+# 16 workers x 200 additions in 1.18 s
+# Expected total quantity: 3200
+# Actual total quantity:   3200
+# No updates were lost.
+
+# ? Before saves were locked and merged, this run failed: workers raced on the
+# ? shared inventory.json.tmp ("worker 4: save failed"), and every save that did
+# ? succeed overwrote the stock the other workers had added.
+
+# ? Worker 0 dies before its final save (--crashes), and a last session recovers
+# ? its journal. With one inventory.journal shared by every session, a session
+# ? replayed the others' unsaved records as its own changes and saved them twice.
@@ -1,30 +1,452 @@
 """Individual Lab: Contact Book Application"""
+from collections import Counter
+from collections.abc import MutableMapping
 from pathlib import Path
+import bisect
+import csv
+import heapq
+import os
+import threading
+
+# Fuzzy search compares overlapping 3-letter pieces of names ("trigrams")
+GRAM_SIZE = 3
+# Most results a search shows
+SEARCH_LIMIT = 10
+# contacts.txt is read and written in 1 MB blocks instead of line by line
+FILE_BUFFER_SIZE = 1024 * 1024
+# A deleted contact is saved as a "tombstone" row: name,,,deleted
+TOMBSTONE = 'deleted'
+# Saving appends only the changes, so old versions of contacts pile up in the file;
+# it is rewritten in the background once it has COMPACT_RATIO times more rows than
+# there are contacts (and at least COMPACT_MIN_ROWS rows)
+COMPACT_RATIO = 2
+COMPACT_MIN_ROWS = 1000
+
+
+def name_words(name):
+    """Return the casefolded words of a name ("Anna Smith" -> ['anna', 'smith'])."""
+    return name.casefold().split()
+
+
+def name_grams(word):
+    """Return the set of trigrams of a word, padded so its ends count as well."""
+    padded = f"  {word}  "
+    return {padded[i:i + GRAM_SIZE] for i in range(len(padded) - GRAM_SIZE + 1)}
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Return the Levenshtein distance between a and b, or max_distance + 1 as soon
+    as it is clear the distance is larger than max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1,  # Delete
+                               current[j - 1] + 1,  # Insert
+                               previous[j - 1] + (char_a != char_b)))  # Replace
+        if min(current) > max_distance:
+            return max_distance + 1  # Every path is already too long
+        previous = current
+    return previous[-1]
+
+
+class ContactSearchIndex:
+    """
+    Search index over the words of contact names, built when the contacts are
+    loaded. Words are casefolded, so "dave" finds "Dave", and a query matches a
+    name when each query word matches one of the name's words:
+    - prefix search binary-searches a sorted list of the distinct words, which
+      works like a trie flattened into one list ("sm" finds every Smith);
+    - fuzzy search finds words sharing enough trigrams with the query word, then
+      ranks them by edit distance, so a one-letter typo like "charlee" still
+      finds "Charlie" (very short words with letters swapped, like "jhon",
+      share too few trigrams to be found).
+    Both work on distinct words, and most names share words with other names,
+    so queries stay fast however many contacts there are.
+    """
+
+    def __init__(self, names=()):
+        self.names_by_word = {}  # casefolded word -> sorted names containing it
+        for name in names:
+            for word in set(name_words(name)):
+                self.names_by_word.setdefault(word, []).append(name)
+        for names_with_word in self.names_by_word.values():
+            names_with_word.sort()
+        self.sorted_words = sorted(self.names_by_word)
+        self.postings = {}  # trigram -> words containing it
+        for word in self.sorted_words:
+            self._index_grams(word)
+
+    def _index_grams(self, word):
+        """Add a new word to the trigram postings."""
+        for gram in name_grams(word):
+            self.postings.setdefault(gram, []).append(word)
+
+    def add(self, name):
+        """Index a contact added after loading."""
+        for word in set(name_words(name)):
+            if word not in self.names_by_word:
+                self.names_by_word[word] = []
+                bisect.insort(self.sorted_words, word)
+                self._index_grams(word)
+            bisect.insort(self.names_by_word[word], name)
+
+    def remove(self, name):
+        """Stop finding a deleted contact."""
+        for word in set(name_words(name)):
+            names_with_word = self.names_by_word[word]
+            del names_with_word[bisect.bisect_left(names_with_word, name)]
+            if not names_with_word:  # No other contact uses this word
+                del self.names_by_word[word]
+                del self.sorted_words[bisect.bisect_left(self.sorted_words, word)]
+                for gram in name_grams(word):
+                    self.postings[gram].remove(word)
+                    if not self.postings[gram]:
+                        del self.postings[gram]
+
+    def words_with_prefix(self, prefix):
+        """Yield the indexed words starting with prefix, in order."""
+        position = bisect.bisect_left(self.sorted_words, prefix)
+        while position < len(self.sorted_words) and \
+                self.sorted_words[position].startswith(prefix):
+            yield self.sorted_words[position]
+            position += 1
+
+    def similar_words(self, query_word):
+        """Return {word: edit distance} for the indexed words close to query_word."""
+        # Allow one typo, or two in long words; very short words must match exactly
+        max_distance = 0 if len(query_word) < 3 else 1 if len(query_word) < 8 else 2
+        if max_distance == 0:
+            return {query_word: 0} if query_word in self.names_by_word else {}
+
+        grams = name_grams(query_word)
+        # One typo changes at most GRAM_SIZE trigrams, so a word within
+        # max_distance typos still has at least this many of the query's trigrams
+        needed = len(grams) - GRAM_SIZE * max_distance
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+
+        similar = {}
+        for word, count in shared.items():
+            if count >= needed:
+                distance = edit_distance(query_word, word, max_distance)
+                if distance <= max_distance:
+                    similar[word] = distance
+        return similar
+
+    def prefix_search(self, query, limit=SEARCH_LIMIT):
+        """Return up to limit names with a word starting with each query word."""
+        words = name_words(query)
+        if not words:
+            return []
+        # Walk the names of the longest (most selective) query word, check the rest
+        words.sort(key=len, reverse=True)
+        first, others = words[0], words[1:]
+
+        results = {}  # A dictionary keeps order and drops repeats
+        for word in self.words_with_prefix(first):
+            for name in self.names_by_word[word]:
+                if name in results:
+                    continue
+                words_of_name = name_words(name)
+                if all(any(name_word.startswith(other) for name_word in words_of_name)
+                       for other in others):
+                    results[name] = None
+                    if len(results) == limit:
+                        return list(results)
+        return list(results)
+
+    def fuzzy_search(self, query, limit=SEARCH_LIMIT):
+        """
+        Return up to limit (total edit distance, name) pairs for names with a word
+        close to each query word, closest first.
+        """
+        words = name_words(query)
+        similar = [self.similar_words(word) for word in words]
+        if not similar or not all(similar):
+            return []
+
+        if len(similar) == 1:
+            # Each word's names are sorted, so the best limit names overall are
+            # among the first limit names of each word
+            ranked = {}
+            for word, distance in similar[0].items():
+                for name in self.names_by_word[word][:limit]:
+                    ranked[name] = min(distance, ranked.get(name, distance))
+            return heapq.nsmallest(limit, ((d, name) for name, d in ranked.items()))
+
+        # Several words: walk the names of the word with the fewest, score the rest
+        def names_covered(matches):
+            return sum(len(self.names_by_word[word]) for word in matches)
+        first = min(range(len(similar)), key=lambda i: names_covered(similar[i]))
+        ranked = {}
+        for word, distance in similar[first].items():
+            for name in self.names_by_word[word]:
+                words_of_name = name_words(name)
+                total = distance
+                for i, matches in enumerate(similar):
+                    if i == first:
+                        continue
+                    distances = [matches[w] for w in words_of_name if w in matches]
+                    if not distances:
+                        break
+                    total += min(distances)
+                else:
+                    ranked[name] = min(total, ranked.get(name, total))
+        return heapq.nsmallest(limit, ((d, name) for name, d in ranked.items()))
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Return up to limit names: prefix matches first, then fuzzy matches."""
+        results = dict.fromkeys(self.prefix_search(query, limit))
+        if len(results) < limit:
+            for _, name in self.fuzzy_search(query, limit):
+                results.setdefault(name)
+        return list(results)[:limit]
+
+
+class ContactBook(MutableMapping):
+    """
+    The contacts dictionary, plus a search index kept in step with it and a note
+    of what changed since the last save, so saving only appends the changes.
+    Every way of changing it (pop, update, clear, ...) goes through __setitem__
+    and __delitem__, so the index and the notes never miss a change.
+    """
+
+    def __init__(self, contacts=None, file_path=None, file_rows=0):
+        self.contacts = dict(contacts or {})  # name -> {'phone': ..., 'email': ...}
+        self.search_index = ContactSearchIndex(self.contacts)
+        self.file_path = file_path  # The file the contacts were loaded from
+        self.file_rows = file_rows  # Rows in that file, old versions included
+        self.changed = set()  # Names added or changed since the last save
+        self.deleted = set()  # Names deleted since the last save
+        self.file_lock = threading.Lock()  # Held while anything writes the file
+        self.compaction = None  # The background compaction thread, while it runs
+        self.appended_during_compaction = []  # Rows it must copy before finishing
+
+    def __getitem__(self, name):
+        return self.contacts[name]
+
+    def __contains__(self, name):
+        return name in self.contacts
+
+    def __iter__(self):
+        return iter(self.contacts)
+
+    def __len__(self):
+        return len(self.contacts)
+
+    def __setitem__(self, name, info):
+        if name not in self.contacts:
+            self.search_index.add(name)
+        self.contacts[name] = info
+        self.changed.add(name)
+        self.deleted.discard(name)
+
+    def __delitem__(self, name):
+        del self.contacts[name]
+        self.search_index.remove(name)
+        self.changed.discard(name)
+        self.deleted.add(name)
+
+
+def write_row(file, writer, fields):
+    """Write one CSV row, quoting fields only if one of them needs it."""
+    line = ','.join(fields) + '\n'
+    if line.count(',') == len(fields) - 1 and line.count('\n') == 1 and \
+            '"' not in line and '\r' not in line:
+        # Nothing to quote, so this is exactly what csv would write; plain
+        # string writes are several times quicker than csv.writer
+        file.write(line)
+    else:
+        # Every field quoted: csv would not quote a lone \r with \n line endings,
+        # and reading it back would fail
+        writer.writerow(fields)
+
+
+def contact_writer(file):
+    """Return the csv writer write_row uses for rows that need quoting."""
+    return csv.writer(file, lineterminator='\n', quoting=csv.QUOTE_ALL)
 
 
 def load_contacts(file_path):
-    """Load contacts from a text file."""
+    """Load contacts from a CSV text file and build their search index."""
     contacts = {}  # Empty dictionary
+    skipped = 0
+    rows = 0  # Every row, including old versions and tombstones
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            for line in file:
-                # Each line in the file is expected to be in the format: name,phone,email
-                name, phone, email = line.strip().split(',')
+        # newline='' lets the csv module handle line breaks inside quoted fields
+        with open(file_path, 'r', encoding='utf-8', newline='',
+                  buffering=FILE_BUFFER_SIZE) as file:
+            for row in csv.reader(file):
+                rows += 1
+                # Each row in the file is expected to be: name,phone,email
+                # (a field containing a comma or quote is wrapped in quotes).
+                # Later rows replace earlier ones, and a tombstone deletes
+                if len(row) == 4 and row[3] == TOMBSTONE:
+                    contacts.pop(row[0], None)
+                    continue
+                if len(row) != 3:
+                    skipped += 1  # A damaged line; keep loading the rest
+                    continue
+                name, phone, email = row
                 # Add the contact information to the contacts dictionary with the name as the
                 # key and a nested dictionary for phone and email
                 contacts[name] = {'phone': phone, 'email': email}
     except FileNotFoundError:
         print("No existing contact book found. Starting with an empty contact book.")
-    return contacts
+    if skipped:
+        print(f"Warning: Skipped {skipped} line(s) that were not name,phone,email.")
+    # Builds the search index once, for every contact
+    return ContactBook(contacts, file_path=Path(file_path), file_rows=rows)
+
+
+def ends_with_newline(file_path):
+    """Return True if the file is empty, missing, or its last byte is a newline."""
+    try:
+        with open(file_path, 'rb') as file:
+            if file.seek(0, os.SEEK_END) == 0:
+                return True
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b'\n'
+    except FileNotFoundError:
+        return True
+
+
+def rewrite_contacts_file(contacts):
+    """Replace the contacts file with one row per contact (safely, via a temporary file)."""
+    tmp_path = Path(f"{contacts.file_path}.rewrite.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='',
+                  buffering=FILE_BUFFER_SIZE) as file:
+            writer = contact_writer(file)
+            for name, info in contacts.items():
+                write_row(file, writer, (name, info['phone'], info['email']))
+            file.flush()
+            os.fsync(file.fileno())
+    except IOError:
+        tmp_path.unlink(missing_ok=True)
+        raise  # save_contacts reports it
+    with contacts.file_lock:
+        os.replace(tmp_path, contacts.file_path)
+        contacts.file_rows = len(contacts)
+    contacts.changed.clear()
+    contacts.deleted.clear()
+
+
+def append_contact_changes(contacts):
+    """
+    Append the rows for contacts added, changed or deleted since the last save to
+    the file they were loaded from. The cost depends on the number of changes,
+    not the size of the contact book.
+    """
+    rows = [(name, contacts[name]['phone'], contacts[name]['email'])
+            for name in contacts.changed]
+    rows += [(name, '', '', TOMBSTONE) for name in contacts.deleted]
+    if not rows:
+        return
+
+    if not ends_with_newline(contacts.file_path):
+        # An earlier append was cut short (a crash or a full disk). Appending
+        # after it would glue our first row onto the torn one, and a torn quoted
+        # field would swallow every row after it. The torn row was never reported
+        # as saved, so write the whole contact book out again instead.
+        wait_for_compaction(contacts)
+        rewrite_contacts_file(contacts)
+        return
+
+    with contacts.file_lock:
+        with open(contacts.file_path, 'a', encoding='utf-8', newline='') as file:
+            writer = contact_writer(file)
+            for row in rows:
+                write_row(file, writer, row)
+            file.flush()
+            os.fsync(file.fileno())  # On the disk before we say it's saved
+        if contacts.compaction is not None:
+            contacts.appended_during_compaction.extend(rows)
+        contacts.file_rows += len(rows)
+    contacts.changed.clear()
+    contacts.deleted.clear()
+
+
+def compact_contacts_file(contacts, snapshot):
+    """
+    Rewrite the contacts file with one row per contact (run in a background thread).
+    snapshot is the list of (name, info) pairs the file held when compaction started;
+    rows appended since then are copied over before the new file replaces the old.
+    """
+    tmp_path = Path(f"{contacts.file_path}.tmp")
+    try:
+        file = open(tmp_path, 'w', encoding='utf-8', newline='',
+                    buffering=FILE_BUFFER_SIZE)
+        with file:
+            writer = contact_writer(file)
+            for name, info in snapshot:
+                write_row(file, writer, (name, info['phone'], info['email']))
+            # Saves wait from here until the new file is in place
+            with contacts.file_lock:
+                appended = contacts.appended_during_compaction
+                for row in appended:
+                    write_row(file, writer, row)
+                file.flush()
+                os.fsync(file.fileno())
+                file.close()
+                os.replace(tmp_path, contacts.file_path)
+                contacts.file_rows = len(snapshot) + len(appended)
+    except IOError:
+        print("Error: Could not compact the contacts file.")
+        tmp_path.unlink(missing_ok=True)
+    finally:
+        with contacts.file_lock:
+            contacts.compaction = None
+            contacts.appended_during_compaction = []
+
+
+def start_compaction(contacts):
+    """Compact the contacts file in the background if it has grown too large."""
+    if contacts.compaction is not None or contacts.file_rows < COMPACT_MIN_ROWS or \
+            contacts.file_rows <= COMPACT_RATIO * len(contacts):
+        return
+    # Everything is saved at this point, so the file holds exactly these contacts
+    snapshot = list(contacts.items())
+    contacts.compaction = threading.Thread(
+        target=compact_contacts_file, args=(contacts, snapshot))
+    contacts.compaction.start()
+
+
+def wait_for_compaction(contacts):
+    """Wait for a background compaction to finish (before the program exits)."""
+    compaction = contacts.compaction
+    if compaction is not None:
+        compaction.join()
 
 
 def save_contacts(contacts, file_path):
-    """Save contacts to a text file."""
+    """
+    Save contacts to a CSV text file, quoting fields that contain commas or quotes.
+    A ContactBook saved to the file it came from only appends its changes.
+    """
+    if isinstance(contacts, ContactBook) and contacts.file_path == Path(file_path):
+        try:
+            append_contact_changes(contacts)
+        except IOError:
+            print("Error: Could not save contacts to file.")
+            return
+        start_compaction(contacts)
+        print("Contacts saved successfully.")
+        return
+
     try:
-        with open(file_path, 'w', encoding='utf-8') as file:
+        with open(file_path, 'w', encoding='utf-8', newline='',
+                  buffering=FILE_BUFFER_SIZE) as file:
+            writer = contact_writer(file)
             for name, info in contacts.items():
                 # Write each contact's information to the file in the format: name,phone,email
-                file.write(f"{name},{info['phone']},{info['email']}\n")
+                write_row(file, writer, (name, info['phone'], info['email']))
         print("Contacts saved successfully.")
     except IOError:
         print("Error: Could not save contacts to file.")
@@ -41,6 +463,16 @@ def add_contact(contacts):
     print(f"Contact '{name}' added successfully.")
 
 
+def delete_contact(contacts):
+    """Delete a contact from the contact book."""
+    name = input("Enter the name of the contact to delete: ")
+    if name in contacts:
+        del contacts[name]
+        print(f"Contact '{name}' deleted successfully.")
+    else:
+        print(f"Contact '{name}' not found.")
+
+
 def display_contacts(contacts):
     """Display all contacts in the contact book."""
     if not contacts:
@@ -53,15 +485,24 @@ def display_contacts(contacts):
 
 
 def search_contact(contacts):
-    """Search for a contact by name."""
+    """Search for a contact by name, or the start of a name, allowing for typos."""
     name = input("Enter the name of the contact to search: ")
     if name in contacts:
         # If the contact is found, retrieve the contact information and display it
         info = contacts[name]
         print(
             f"Contact found - Name: {name}, Phone: {info['phone']}, Email: {info['email']}")
-    else:
+        return
+
+    # Not an exact match: try the start of a name, any case, then close spellings
+    matches = contacts.search_index.search(name)
+    if not matches:
         print(f"Contact '{name}' not found.")
+        return
+    print(f"{len(matches)} contact(s) matching '{name}':")
+    for match in matches:
+        info = contacts[match]
+        print(f"Name: {match}, Phone: {info['phone']}, Email: {info['email']}")
 
 
 def main():
@@ -75,18 +516,25 @@ def main():
         print("1. Add Contact")
         print("2. Display Contacts")
         print("3. Search Contact")
-        print("4. Save and Exit")
+        print("4. Delete Contact")
+        print("5. Save and Exit")
 
         choice = input("Enter your choice: ")
 
         if choice == '1':
             add_contact(contacts)
+            # Saving appends just this change, so do it now rather than at exit
+            save_contacts(contacts, contacts_file)
         elif choice == '2':
             display_contacts(contacts)
         elif choice == '3':
             search_contact(contacts)
         elif choice == '4':
+            delete_contact(contacts)
+            save_contacts(contacts, contacts_file)
+        elif choice == '5':
             save_contacts(contacts, contacts_file)
+            wait_for_compaction(contacts)
             break
         else:
             print("Invalid choice. Please try again.")
@@ -100,7 +548,8 @@ if __name__ == "__main__":
 # 1. Add Contact
 # 2. Display Contacts
 # 3. Search Contact
-# 4. Save and Exit
+# 4. Delete Contact
+# 5. Save and Exit
 # Enter your choice: 2
 
 # Contact Book:
@@ -113,6 +562,7 @@ if __name__ == "__main__":
 # Enter contact phone number: 07333333333
 # Enter contact email address: dave@gmail.com
 # Contact 'Dave' added successfully.
+# Contacts saved successfully.
 
 # Enter your choice: 2
 
@@ -124,17 +574,36 @@ if __name__ == "__main__":
 
 # Enter your choice: 3
 # Enter the name of the contact to search: dave
-# Contact 'dave' not found.
+# 1 contact(s) matching 'dave':
+# Name: Dave, Phone: 07333333333, Email: dave@gmail.com
+
+# Enter your choice: 3
+# Enter the name of the contact to search: charlee
+# 1 contact(s) matching 'charlee':
+# Name: Charlie, Phone: 07222222222, Email: charlie@gmail.com
+
+# Enter your choice: 3
+# Enter the name of the contact to search: Zoe
+# Contact 'Zoe' not found.
 
 # Enter your choice: 3
 # Enter the name of the contact to search: Dave
 # Contact found - Name: Dave, Phone: 07333333333, Email: dave@gmail.com
 
 # Enter your choice: 4
+# Enter the name of the contact to delete: Bob
+# Contact 'Bob' deleted successfully.
+# Contacts saved successfully.
+
+# Enter your choice: 5
 # Contacts saved successfully.
 
-# ? After exiting, the contacts.txt file will contain the following data:
+# ? Each save only appends what changed, so after exiting the contacts.txt file
+# ? will contain the following data (the last line is a "tombstone" for Bob):
 # Anton,07123456789,anton@gmail.com
 # Bob,07111111111,bob@gmail.com
 # Charlie,07222222222,charlie@gmail.com
 # Dave,07333333333,dave@gmail.com
+# Bob,,,deleted
+# ? Once the file holds more than twice as many rows as there are contacts (and
+# ? at least 1,000 rows), it is rewritten without the old rows in the background.